@@ -1,11 +1,18 @@
 from typing import Sequence
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     SECRET: str
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 25
+    DB_MAX_OVERFLOW: int = 25
+    DB_POOL_RECYCLE: int = 300
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_PRE_PING: bool = False
+    DB_ECHO: bool = False
     VERSION: str = "1.0.0"
     LOG_LEVEL: str = "INFO"
     JWT_ALGORITHM: str = "HS256"
@@ -18,6 +25,15 @@ class Settings(BaseSettings):
     STRIPE_MODE: str = "test"
     PLATFORM_FEE_AMOUNT: float = 50.00
     PLATFORM_FEE_CURRENCY: str = "USD"
+    WEBHOOK_EVENT_RETENTION_DAYS: int = 30
+
+    @field_validator("DATABASE_URL")
+    @classmethod
+    def use_asyncpg_driver(cls, value: str) -> str:
+        for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+            if value.startswith(prefix):
+                return "postgresql+asyncpg://" + value[len(prefix):]
+        return value
 
     class Config:
         env_file = ".env"
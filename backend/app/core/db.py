@@ -1,8 +1,10 @@
 import argparse
 import asyncio
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from sqlalchemy import delete, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -13,6 +15,7 @@ from sqlalchemy.ext.asyncio import (
 from app.core.base import BaseModel
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.models.webhook_event import ProcessedWebhookEvent
 
 logger = get_logger(__name__)
 
@@ -23,9 +26,13 @@ if not connection_string:
 
 engine = create_async_engine(
     connection_string,
-    echo=True,
+    echo=settings.DB_ECHO,
     future=True,
-    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -51,6 +58,8 @@ async def get_db():
 async def init_db(engine: AsyncEngine) -> None:
     try:
         async with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             await conn.run_sync(BaseModel.metadata.create_all)
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
@@ -75,6 +84,23 @@ async def reset_db(engine: AsyncEngine) -> None:
         raise
 
 
+async def purge_webhook_events(engine: AsyncEngine) -> int:
+    # Stripe stops redelivering an event after three days, so older claims
+    # can no longer stop a duplicate and only grow the table.
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+        days=settings.WEBHOOK_EVENT_RETENTION_DAYS)
+    try:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                delete(ProcessedWebhookEvent)
+                .where(ProcessedWebhookEvent.created_at < cutoff)
+            )
+        return result.rowcount
+    except Exception as e:
+        logger.error(f"Error purging processed webhook events: {e}")
+        raise
+
+
 async def create_tables():
     try:
         await init_db(engine)
@@ -104,7 +130,7 @@ async def main():
     parser.add_argument(
         "command",
         choices=[
-            "create-tables", "reset"
+            "create-tables", "reset", "purge-webhook-events"
         ],
         help="Database management command to run"
     )
@@ -116,6 +142,9 @@ async def main():
             await create_tables()
         elif args.command == "reset":
             await reset_database()
+        elif args.command == "purge-webhook-events":
+            purged = await purge_webhook_events(engine)
+            logger.info(f"Purged {purged} processed webhook events")
     finally:
         await engine.dispose()
 
@@ -2,7 +2,7 @@ import time
 from typing import Callable
 from uuid import uuid4
 
-from fastapi import Request, Response
+from fastapi import HTTPException, Request, Response, status
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.core.logger import get_logger
@@ -83,7 +83,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         if self.request_counts[client_ip][current_time] >= self.requests_per_minute:
             logger.warning(f"Rate limit exceeded for client: {client_ip}")
-            from fastapi import HTTPException, status
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail="Rate limit exceeded. Please try again later."
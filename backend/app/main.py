@@ -11,8 +11,8 @@ from app.core.middleware import (
     RateLimitMiddleware,
     SecurityMiddleware,
 )
+from app.core.responses import ORJSONResponse
 from app.routers.index import router as main_router
-from app.routers.websocket_router import router as websocket_router
 
 
 @asynccontextmanager
@@ -26,6 +26,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -41,7 +42,6 @@ app.add_middleware(SecurityMiddleware)
 app.add_middleware(RateLimitMiddleware, requests_per_minute=100)
 
 app.include_router(main_router)
-app.include_router(websocket_router)
 
 if __name__ == "__main__":
     uvicorn.run(
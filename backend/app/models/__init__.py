@@ -6,6 +6,7 @@ from app.models.message import Message
 from app.models.payment import Payment
 from app.models.project import Project
 from app.models.user import User, UserType
+from app.models.webhook_event import ProcessedWebhookEvent
 
 __all__ = [
     "User",
@@ -16,4 +17,5 @@ __all__ = [
     "Chat",
     "Message",
     "Payment",
+    "ProcessedWebhookEvent",
 ]
@@ -1,6 +1,14 @@
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.base import BaseModel
@@ -11,11 +19,18 @@ if TYPE_CHECKING:
 
 class Chat(BaseModel):
     __tablename__ = "chats"
+    __table_args__ = (
+        Index(
+            "ix_chats_initiator_id_participant_id",
+            "initiator_id",
+            "participant_id"
+        ),
+    )
 
     initiator_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id"), nullable=False)
     participant_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False)
+        Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     is_archived_by_initiator: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False)
@@ -29,7 +44,7 @@ class Chat(BaseModel):
                            ] = mapped_column(String, nullable=True)
 
     last_message_at: Mapped[Optional[DateTime]
-                            ] = mapped_column(DateTime, nullable=True)
+                            ] = mapped_column(DateTime, nullable=True, index=True)
 
     initiator: Mapped["User"] = relationship(
         "User",
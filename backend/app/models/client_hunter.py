@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, ForeignKey, String
+from sqlalchemy import Boolean, ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.base import BaseModel
@@ -10,6 +10,13 @@ if TYPE_CHECKING:
 
 class ClientHunter(BaseModel):
     __tablename__ = "client_hunters"
+    __table_args__ = (
+        Index(
+            "ix_client_hunters_is_paid",
+            "is_paid",
+            postgresql_where=text("is_paid")
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id"), nullable=False, unique=True)
@@ -1,6 +1,16 @@
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import JSON, Boolean, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    cast,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.base import BaseModel
@@ -11,6 +21,25 @@ if TYPE_CHECKING:
 
 class Freelancer(BaseModel):
     __tablename__ = "freelancers"
+    __table_args__ = (
+        Index(
+            "ix_freelancers_rate_experience",
+            "hourly_rate",
+            "years_of_experience"
+        ),
+        Index(
+            "ix_freelancers_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_freelancers_bio_trgm",
+            "bio",
+            postgresql_using="gin",
+            postgresql_ops={"bio": "gin_trgm_ops"}
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id"), nullable=False, unique=True)
@@ -23,7 +52,7 @@ class Freelancer(BaseModel):
     years_of_experience: Mapped[int] = mapped_column(
         Integer, nullable=False, default=0)
 
-    skills: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    skills: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
 
     portfolio_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     github_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -41,3 +70,12 @@ class Freelancer(BaseModel):
 
     def __repr__(self):
         return f"<Freelancer(id={self.id}, user_id={self.user_id}, title={self.title})>"
+
+# Skill filters match case-insensitive substrings of the serialized array,
+# so the trigram index is built on the same skills::text expression.
+Index(
+    "ix_freelancers_skills_trgm",
+    cast(Freelancer.skills, Text).label("skills_text"),
+    postgresql_using="gin",
+    postgresql_ops={"skills_text": "gin_trgm_ops"}
+)
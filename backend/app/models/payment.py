@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.base import BaseModel
@@ -9,8 +9,11 @@ from app.core.base import BaseModel
 
 class Payment(BaseModel):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_user_id_status", "user_id", "status"),
+    )
     
-    user_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
     stripe_payment_intent_id: Mapped[str] = mapped_column(
         String, unique=True, nullable=False, index=True)
     stripe_customer_id: Mapped[Optional[str]] = mapped_column(
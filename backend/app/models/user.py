@@ -2,7 +2,7 @@ import enum
 from typing import TYPE_CHECKING, Optional
 
 from passlib.context import CryptContext
-from sqlalchemy import Boolean, Enum, String
+from sqlalchemy import Boolean, Enum, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.base import BaseModel
@@ -25,6 +25,25 @@ class UserType(str, enum.Enum):
 
 class User(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        Index(
+            "ix_users_user_type_active",
+            "user_type",
+            postgresql_where=text("is_active")
+        ),
+        Index(
+            "ix_users_first_name_trgm",
+            "first_name",
+            postgresql_using="gin",
+            postgresql_ops={"first_name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_users_last_name_trgm",
+            "last_name",
+            postgresql_using="gin",
+            postgresql_ops={"last_name": "gin_trgm_ops"}
+        ),
+    )
     
     email: Mapped[str] = mapped_column(
         String, unique=True, index=True, nullable=False)
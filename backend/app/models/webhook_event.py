@@ -0,0 +1,20 @@
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.base import BaseModel
+
+
+class ProcessedWebhookEvent(BaseModel):
+    __tablename__ = "processed_webhook_events"
+    __table_args__ = (
+        Index("ix_processed_webhook_events_created_at", "created_at"),
+    )
+
+    event_id: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<ProcessedWebhookEvent(id={self.id}, event_id={self.event_id}, "
+            f"event_type={self.event_type})>"
+        )
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -11,6 +12,7 @@ from app.core.logger import get_logger
 from app.models.client_hunter import ClientHunter
 from app.models.freelancer import Freelancer
 from app.models.user import User
+from app.routers.freelancer_router import invalidate_filter_options
 from app.schemas.user_schema import (
     LoginResponse,
     LoginUserResponse,
@@ -50,10 +52,9 @@ async def register_user(
             user_data_dict["profile_picture"] = None
 
         user = User(**user_data_dict)
-        user.set_password(user_data.password)
+        await asyncio.to_thread(user.set_password, user_data.password)
         session.add(user)
-        await session.commit()
-        await session.refresh(user)
+        await session.flush()
 
         if user.user_type == "client_hunter":
             client_hunter = ClientHunter(
@@ -77,7 +78,9 @@ async def register_user(
             session.add(freelancer)
 
         await session.commit()
-        await session.refresh(user)
+
+        if user.user_type == "freelancer":
+            invalidate_filter_options()
 
         access_token = create_access_token(
             data={"sub": str(user.id)},
@@ -90,9 +93,7 @@ async def register_user(
             token_type="bearer"
         )
     except Exception as e:
-        logger.error(f"Registration error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Registration error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Registration failed: {str(e)}"
@@ -107,8 +108,26 @@ async def login_user(
         select(User).where(User.email == user_credentials.email)
     )
     user = result.scalar_one_or_none()
-    
-    if not user or not user.verify_password(user_credentials.password):
+
+    password_valid = False
+    if user:
+        password_check = asyncio.to_thread(
+            user.verify_password, user_credentials.password
+        )
+        if user.user_type == "freelancer":
+            password_valid = await password_check
+            payment_status = "paid"
+        else:
+            password_valid, is_paid = await asyncio.gather(
+                password_check,
+                session.scalar(
+                    select(ClientHunter.is_paid)
+                    .where(ClientHunter.user_id == user.id)
+                )
+            )
+            payment_status = "paid" if is_paid else "unpaid"
+
+    if not user or not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -126,16 +145,6 @@ async def login_user(
         expires_delta=settings.JWT_EXPIRATION_MINUTES
     )
 
-    if user.user_type == "freelancer":
-        payment_status = "paid"
-    else:
-        from app.models.client_hunter import ClientHunter
-        client_hunter_result = await session.execute(
-            select(ClientHunter).where(ClientHunter.user_id == user.id)
-        )
-        client_hunter = client_hunter_result.scalar_one_or_none()
-        payment_status = "paid" if client_hunter and client_hunter.is_paid else "unpaid"
-
     return LoginResponse(
         access_token=access_token,
         user=LoginUserResponse(
@@ -1,10 +1,30 @@
 from datetime import datetime, timezone
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, desc, func, or_, select
+from cachetools import TTLCache
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import (
+    Row,
+    and_,
+    case,
+    desc,
+    func,
+    lambda_stmt,
+    not_,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, joinedload, raiseload
 
 from app.core.db import get_db
 from app.models.chat import Chat
@@ -19,20 +39,101 @@ from app.schemas.chat_schema import (
     ChatUpdate,
     ChatWithParticipants,
 )
+from app.utils.http_cache import etag_matches, make_etag
 
 router = APIRouter(prefix="/chats", tags=["Chat Management"])
 
-async def get_chat_participant(
+initiator_user = aliased(User, name="initiator_user")
+participant_user = aliased(User, name="participant_user")
+
+chat_stats_cache: TTLCache[int, ChatStats] = TTLCache(maxsize=10_000, ttl=10)
+
+def invalidate_chat_stats(*user_ids: int) -> None:
+    for user_id in user_ids:
+        chat_stats_cache.pop(user_id, None)
+
+user_chat_ids_cache: TTLCache[int, list[int]] = TTLCache(
+    maxsize=10_000, ttl=60)
+
+async def get_user_chat_ids(user_id: int, session: AsyncSession) -> list[int]:
+    chat_ids = user_chat_ids_cache.get(user_id)
+    if chat_ids is None:
+        result = await session.execute(
+            select(Chat.id).where(
+                or_(
+                    Chat.initiator_id == user_id,
+                    Chat.participant_id == user_id
+                )
+            )
+        )
+        chat_ids = list(result.scalars().all())
+        user_chat_ids_cache[user_id] = chat_ids
+
+    return chat_ids
+
+_month_start_cache: tuple[tuple[int, int], datetime] = ((0, 0), datetime.min)
+
+def _current_month_start() -> datetime:
+    global _month_start_cache
+    today = datetime.now(timezone.utc)
+    key = (today.year, today.month)
+    if _month_start_cache[0] != key:
+        _month_start_cache = (key, datetime(today.year, today.month, 1))
+    return _month_start_cache[1]
+
+def build_chat_with_participants(
+    chat: Chat,
+    unread_count: int = 0,
+    last_message_preview: Optional[str] = None
+) -> ChatWithParticipants:
+    initiator = chat.initiator
+    participant = chat.participant
+
+    return ChatWithParticipants.model_construct(
+        id=chat.id,
+        initiator_id=chat.initiator_id,
+        participant_id=chat.participant_id,
+        project_title=chat.project_title,
+        project_description=chat.project_description,
+        project_budget=chat.project_budget,
+        is_archived_by_initiator=chat.is_archived_by_initiator,
+        is_archived_by_participant=chat.is_archived_by_participant,
+        last_message_at=chat.last_message_at,
+        created_at=chat.created_at,
+        updated_at=chat.updated_at,
+        initiator_name=initiator.full_name if initiator else "Unknown",
+        participant_name=participant.full_name if participant else "Unknown",
+        initiator_type=(
+            initiator.user_type if initiator else UserType.CLIENT_HUNTER
+        ),
+        participant_type=(
+            participant.user_type if participant else UserType.CLIENT_HUNTER
+        ),
+        initiator_profile_picture=(
+            initiator.profile_picture if initiator else None
+        ),
+        participant_profile_picture=(
+            participant.profile_picture if participant else None
+        ),
+        unread_count=unread_count,
+        last_message_preview=last_message_preview
+    )
+
+async def get_participant_chat_version(
     chat_id: int,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)]
-) -> Chat:
+) -> Row:
     result = await session.execute(
-        select(Chat)
-        .options(
-            selectinload(Chat.initiator),
-            selectinload(Chat.participant)
+        select(
+            Chat.id,
+            Chat.updated_at,
+            Chat.last_message_at,
+            initiator_user.updated_at.label("initiator_updated_at"),
+            participant_user.updated_at.label("participant_updated_at")
         )
+        .outerjoin(initiator_user, Chat.initiator_id == initiator_user.id)
+        .outerjoin(participant_user, Chat.participant_id == participant_user.id)
         .where(
             and_(
                 Chat.id == chat_id,
@@ -43,15 +144,15 @@ async def get_chat_participant(
             )
         )
     )
-    chat = result.scalar_one_or_none()
+    chat_version = result.one_or_none()
 
-    if not chat:
+    if chat_version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Chat not found or access denied"
         )
 
-    return chat
+    return chat_version
 
 @router.post("/", response_model=ChatRead, status_code=status.HTTP_201_CREATED)
 async def create_chat(
@@ -104,12 +205,17 @@ async def create_chat(
 
     session.add(chat)
     await session.commit()
-    await session.refresh(chat)
+
+    invalidate_chat_stats(chat.initiator_id, chat.participant_id)
+    user_chat_ids_cache.pop(chat.initiator_id, None)
+    user_chat_ids_cache.pop(chat.participant_id, None)
 
     return chat
 
 @router.get("/", response_model=ChatList)
 async def list_user_chats(
+    request: Request,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
     is_archived_by_initiator: Optional[bool] = Query(
@@ -119,92 +225,140 @@ async def list_user_chats(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size")
 ):
-    query = select(Chat).where(
+    user_id = current_user.id
+
+    chat_filters = [
         or_(
-            Chat.initiator_id == current_user.id,
-            Chat.participant_id == current_user.id
+            Chat.initiator_id == user_id,
+            Chat.participant_id == user_id
+        )
+    ]
+    count_query = lambda_stmt(
+        lambda: select(
+            func.count(Chat.id),
+            func.max(Chat.updated_at),
+            func.max(Chat.last_message_at),
+            func.max(initiator_user.updated_at),
+            func.max(participant_user.updated_at)
+        ).join(
+            initiator_user, Chat.initiator_id == initiator_user.id
+        ).join(
+            participant_user, Chat.participant_id == participant_user.id
+        ).where(
+            or_(
+                Chat.initiator_id == user_id,
+                Chat.participant_id == user_id
+            )
         )
     )
 
     if current_user.user_type == UserType.FREELANCER:
         if is_archived_by_initiator is not None:
-            query = query.where(
+            chat_filters.append(
+                Chat.is_archived_by_initiator == is_archived_by_initiator)
+            count_query += lambda s: s.where(
                 Chat.is_archived_by_initiator == is_archived_by_initiator)
     else:
         if is_archived_by_participant is not None:
-            query = query.where(
+            chat_filters.append(
+                Chat.is_archived_by_participant == is_archived_by_participant)
+            count_query += lambda s: s.where(
                 Chat.is_archived_by_participant == is_archived_by_participant)
 
-    count_query = select(func.count()).select_from(query.subquery())
+    # The aggregate over the user's chats is enough to build the ETag, so a
+    # revalidation is answered before the page itself is loaded.
     total_result = await session.execute(count_query)
-    total = total_result.scalar() or 0
-
+    total, *last_changes = total_result.one()
+
+    etag = make_etag(user_id, str(request.query_params), total, *last_changes)
+    if etag_matches(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    query = select(
+        Chat.id,
+        Chat.initiator_id,
+        Chat.participant_id,
+        Chat.project_title,
+        Chat.project_description,
+        Chat.project_budget,
+        Chat.is_archived_by_initiator,
+        Chat.is_archived_by_participant,
+        Chat.last_message_at,
+        Chat.created_at,
+        Chat.updated_at,
+        (initiator_user.first_name + " " + initiator_user.last_name).label(
+            "initiator_name"),
+        (participant_user.first_name + " " + participant_user.last_name).label(
+            "participant_name"),
+        initiator_user.user_type.label("initiator_type"),
+        participant_user.user_type.label("participant_type"),
+        initiator_user.profile_picture.label("initiator_profile_picture"),
+        participant_user.profile_picture.label("participant_profile_picture")
+    ).join(
+        initiator_user, Chat.initiator_id == initiator_user.id
+    ).join(
+        participant_user, Chat.participant_id == participant_user.id
+    ).where(*chat_filters)
     query = query.order_by(desc(Chat.last_message_at), desc(Chat.updated_at))
     query = query.offset((page - 1) * size).limit(size)
 
-    query = query.options(
-        selectinload(Chat.initiator),
-        selectinload(Chat.participant)
-    )
-
     result = await session.execute(query)
-    chats = result.scalars().all()
-
-    chat_list = []
-    for chat in chats:
+    rows = result.mappings().all()
+
+    page_chat_ids = [row["id"] for row in rows]
+    last_messages = {}
+    unread_counts = {}
+
+    if page_chat_ids:
+        ranked_messages = select(
+            Message.chat_id,
+            func.substr(Message.content, 1, 101).label("preview"),
+            func.length(Message.content).label("content_length"),
+            func.row_number().over(
+                partition_by=Message.chat_id,
+                order_by=desc(Message.created_at)
+            ).label("rn")
+        ).where(
+            Message.chat_id.in_(page_chat_ids)
+        ).subquery()
 
         last_message_result = await session.execute(
-            select(Message).where(
-                Message.chat_id == chat.id
-            ).order_by(desc(Message.created_at)).limit(1)
+            select(
+                ranked_messages.c.chat_id,
+                ranked_messages.c.preview,
+                ranked_messages.c.content_length
+            )
+            .where(ranked_messages.c.rn == 1)
         )
-        last_message = last_message_result.scalar_one_or_none()
+        last_messages = {
+            chat_id: preview[:100] + "..." if content_length > 100 else preview
+            for chat_id, preview, content_length in last_message_result.tuples()
+        }
 
         unread_result = await session.execute(
-            select(func.count(Message.id)).where(
+            select(Message.chat_id, func.count(Message.id))
+            .where(
                 and_(
-                    Message.chat_id == chat.id,
+                    Message.chat_id.in_(page_chat_ids),
                     Message.sender_id != current_user.id
                 )
             )
+            .group_by(Message.chat_id)
         )
-        unread_count = unread_result.scalar() or 0
-
-        initiator_name = (
-            chat.initiator.full_name if chat.initiator else ""
-        )
-        participant_name = (
-            chat.participant.full_name if chat.participant else ""
-        )
-        initiator_type = (
-            chat.initiator.user_type if chat.initiator else UserType.CLIENT_HUNTER
-        )
-        participant_type = (
-            chat.participant.user_type if chat.participant else UserType.CLIENT_HUNTER
-        )
+        unread_counts = dict(unread_result.tuples().all())
 
-        if last_message and len(str(last_message.content)) > 100:
-            message_preview = str(last_message.content)[:100] + "..."
-        else:
-            message_preview = str(
-                last_message.content) if last_message else None
-
-        chat_with_participants = ChatWithParticipants(
-            **chat.__dict__,
-            initiator_name=initiator_name,
-            participant_name=participant_name,
-            initiator_type=initiator_type,
-            participant_type=participant_type,
-            initiator_profile_picture=chat.initiator.\
-                profile_picture if chat.initiator else None,
-            participant_profile_picture=chat.participant.\
-                profile_picture if chat.participant else None,
-            unread_count=unread_count,
-            last_message_preview=message_preview
+    chat_list = [
+        ChatWithParticipants.model_construct(
+            **row,
+            unread_count=unread_counts.get(row["id"], 0),
+            last_message_preview=last_messages.get(row["id"])
         )
-        chat_list.append(chat_with_participants)
+        for row in rows
+    ]
 
-    return ChatList(
+    return ChatList.model_construct(
         chats=chat_list,
         total=total,
         page=page,
@@ -215,69 +369,123 @@ async def list_user_chats(
 
 @router.get("/{chat_id}", response_model=ChatWithParticipants)
 async def get_chat(
-    chat: Annotated[Chat, Depends(get_chat_participant)]
+    request: Request,
+    response: Response,
+    chat_version: Annotated[Row, Depends(get_participant_chat_version)],
+    session: Annotated[AsyncSession, Depends(get_db)]
 ):
-    initiator_name = (
-        chat.initiator.full_name if chat.initiator else "Unknown"
-    )
-    participant_name = (
-        chat.participant.full_name if chat.participant else "Unknown"
-    )
-    initiator_type = (
-        chat.initiator.user_type if chat.initiator else UserType.CLIENT_HUNTER
-    )
-    participant_type = (
-        chat.participant.user_type if chat.participant else UserType.CLIENT_HUNTER
+    etag = make_etag(*chat_version)
+    if etag_matches(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    # Access was checked by the version lookup, so only a changed chat pays
+    # for loading both participants.
+    result = await session.execute(
+        select(Chat)
+        .options(
+            joinedload(Chat.initiator),
+            joinedload(Chat.participant),
+            raiseload("*")
+        )
+        .where(Chat.id == chat_version.id)
     )
+    chat = result.scalar_one_or_none()
 
-    return ChatWithParticipants(
-        **chat.__dict__,
-        initiator_name=initiator_name,
-        participant_name=participant_name,
-        initiator_type=initiator_type,
-        participant_type=participant_type,
-        initiator_profile_picture=chat.initiator.\
-            profile_picture if chat.initiator else None,
-        participant_profile_picture=chat.participant.\
-            profile_picture if chat.participant else None,
-        unread_count=0,
-        last_message_preview=None
-    )
+    if not chat:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chat not found or access denied"
+        )
+
+    return build_chat_with_participants(chat)
 
 @router.put("/{chat_id}", response_model=ChatRead)
 async def update_chat(
+    chat_id: int,
     chat_update: ChatUpdate,
-    chat: Annotated[Chat, Depends(get_chat_participant)],
+    current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)]
 ):
-    for field, value in chat_update.dict(exclude_unset=True).items():
-        setattr(chat, field, value)
+    chat_filter = and_(
+        Chat.id == chat_id,
+        or_(
+            Chat.initiator_id == current_user.id,
+            Chat.participant_id == current_user.id
+        )
+    )
 
-    chat.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    update_values = chat_update.model_dump(exclude_unset=True)
+    if update_values:
+        result = await session.execute(
+            update(Chat)
+            .where(chat_filter)
+            .values(**update_values)
+            .returning(Chat)
+        )
+    else:
+        result = await session.execute(select(Chat).where(chat_filter))
+    chat = result.scalar_one_or_none()
+
+    if not chat:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chat not found or access denied"
+        )
+
+    if not update_values:
+        return chat
 
-    session.add(chat)
     await session.commit()
-    await session.refresh(chat)
+
+    invalidate_chat_stats(chat.initiator_id, chat.participant_id)
 
     return chat
 
 
 @router.patch("/{chat_id}/toggle-archive", response_model=ChatRead)
 async def toggle_chat_archive(
-    chat: Annotated[Chat, Depends(get_chat_participant)],
+    chat_id: int,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)]
 ):
-    if chat.initiator_id == current_user.id:
-        chat.is_archived_by_initiator = not chat.is_archived_by_initiator
-    else:
-        chat.is_archived_by_participant = not chat.is_archived_by_participant
+    is_initiator = Chat.initiator_id == current_user.id
+
+    result = await session.execute(
+        update(Chat)
+        .where(
+            and_(
+                Chat.id == chat_id,
+                or_(
+                    is_initiator,
+                    Chat.participant_id == current_user.id
+                )
+            )
+        )
+        .values(
+            is_archived_by_initiator=case(
+                (is_initiator, not_(Chat.is_archived_by_initiator)),
+                else_=Chat.is_archived_by_initiator
+            ),
+            is_archived_by_participant=case(
+                (is_initiator, Chat.is_archived_by_participant),
+                else_=not_(Chat.is_archived_by_participant)
+            )
+        )
+        .returning(Chat)
+    )
+    chat = result.scalar_one_or_none()
 
-    chat.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    if not chat:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chat not found or access denied"
+        )
 
-    session.add(chat)
     await session.commit()
-    await session.refresh(chat)
+
+    invalidate_chat_stats(chat.initiator_id, chat.participant_id)
 
     return chat
 
@@ -286,124 +494,67 @@ async def get_chat_stats(
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)]
 ):
-    total_chats_result = await session.execute(
-        select(func.count(Chat.id)).where(
-            or_(
-                Chat.initiator_id == current_user.id,
-                Chat.participant_id == current_user.id
-            )
-        )
-    )
-    total_chats = total_chats_result.scalar() or 0
+    cached_stats = chat_stats_cache.get(current_user.id)
+    if cached_stats is not None:
+        return cached_stats
 
-    if current_user.user_type == UserType.FREELANCER:
-        active_chats_result = await session.execute(
-            select(func.count(Chat.id)).where(
-                and_(
-                    or_(
-                        Chat.initiator_id == current_user.id,
-                        Chat.participant_id == current_user.id
-                    ),
-                    Chat.is_archived_by_initiator.is_(False)
-                )
-            )
-        )
-    else:
-        active_chats_result = await session.execute(
-            select(func.count(Chat.id)).where(
-                and_(
-                    or_(
-                        Chat.initiator_id == current_user.id,
-                        Chat.participant_id == current_user.id
-                    ),
-                    Chat.is_archived_by_participant.is_(False)
-                )
-            )
-        )
-    active_chats = active_chats_result.scalar() or 0
+    current_month = _current_month_start()
+    user_id = current_user.id
 
     if current_user.user_type == UserType.FREELANCER:
-        archived_chats_result = await session.execute(
-            select(func.count(Chat.id)).where(
-                and_(
-                    or_(
-                        Chat.initiator_id == current_user.id,
-                        Chat.participant_id == current_user.id
-                    ),
-                    Chat.is_archived_by_initiator.is_(True)
-                )
-            )
-        )
+        archived_column = Chat.is_archived_by_initiator
     else:
-        archived_chats_result = await session.execute(
-            select(func.count(Chat.id)).where(
-                and_(
-                    or_(
-                        Chat.initiator_id == current_user.id,
-                        Chat.participant_id == current_user.id
-                    ),
-                    Chat.is_archived_by_participant.is_(True)
-                )
-            )
-        )
-    archived_chats = archived_chats_result.scalar() or 0
-
-    total_messages_result = await session.execute(
-        select(func.count(Message.id)).where(
-            Message.chat_id.in_(
-                select(Chat.id).where(
-                    or_(
-                        Chat.initiator_id == current_user.id,
-                        Chat.participant_id == current_user.id
-                    )
-                )
-            )
-        )
-    )
-    total_messages = total_messages_result.scalar() or 0
-
-    unread_messages = 0
-
-    current_month = datetime.now(timezone.utc).replace(
-        day=1, hour=0, minute=0, second=0, microsecond=0
-    )
-
-    chats_this_month_result = await session.execute(
-        select(func.count(Chat.id)).where(
-            and_(
+        archived_column = Chat.is_archived_by_participant
+
+    chat_counts_result = await session.execute(
+        lambda_stmt(
+            lambda: select(
+                func.count(Chat.id).label("total"),
+                func.count(Chat.id).filter(
+                    archived_column.is_(False)).label("active"),
+                func.count(Chat.id).filter(
+                    archived_column.is_(True)).label("archived"),
+                func.count(Chat.id).filter(
+                    Chat.created_at >= current_month).label("this_month")
+            ).where(
                 or_(
-                    Chat.initiator_id == current_user.id,
-                    Chat.participant_id == current_user.id
-                ),
-                Chat.created_at >= current_month
+                    Chat.initiator_id == user_id,
+                    Chat.participant_id == user_id
+                )
             )
         )
     )
-    chats_this_month = chats_this_month_result.scalar() or 0
-
-    messages_this_month_result = await session.execute(
-        select(func.count(Message.id)).where(
-            and_(
+    chat_counts = chat_counts_result.one()
+
+    message_counts_result = await session.execute(
+        lambda_stmt(
+            lambda: select(
+                func.count(Message.id).label("total"),
+                func.count(Message.id).filter(
+                    Message.created_at >= current_month).label("this_month")
+            ).where(
                 Message.chat_id.in_(
                     select(Chat.id).where(
                         or_(
-                            Chat.initiator_id == current_user.id,
-                            Chat.participant_id == current_user.id
+                            Chat.initiator_id == user_id,
+                            Chat.participant_id == user_id
                         )
                     )
-                ),
-                Message.created_at >= current_month
+                )
             )
         )
     )
-    messages_this_month = messages_this_month_result.scalar() or 0
-
-    return ChatStats(
-        total_chats=total_chats,
-        active_chats=active_chats,
-        archived_chats=archived_chats,
-        total_messages=total_messages,
-        unread_messages=unread_messages,
-        chats_this_month=chats_this_month,
-        messages_this_month=messages_this_month
+    message_counts = message_counts_result.one()
+
+    chat_stats = ChatStats(
+        total_chats=chat_counts.total or 0,
+        active_chats=chat_counts.active or 0,
+        archived_chats=chat_counts.archived or 0,
+        total_messages=message_counts.total or 0,
+        unread_messages=0,
+        chats_this_month=chat_counts.this_month or 0,
+        messages_this_month=message_counts.this_month or 0
     )
+    chat_stats_cache[current_user.id] = chat_stats
+
+    return chat_stats
@@ -1,9 +1,8 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import func, not_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.db import get_db
 from app.core.logger import get_logger
@@ -17,6 +16,7 @@ from app.schemas.user_schema import (
     UserUpdate,
 )
 from app.utils.auth_utils import get_current_user
+from app.utils.query_utils import schema_bundle
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/client_hunter", tags=["Client Hunter Management"])
@@ -30,48 +30,35 @@ class StatusToggleResponse(BaseModel):
     message: str
     is_active: bool
 
+user_columns = schema_bundle("user", User, UserRead)
+client_hunter_columns = schema_bundle(
+    "client_hunter", ClientHunter, ClientHunterProfileSummary)
+
 @router.get("/{client_hunter_id}", response_model=ComprehensiveUserResponse)
 async def get_client_hunter(
     client_hunter_id: int,
     session: AsyncSession = Depends(get_db)
 ):
     result = await session.execute(
-        select(User)
-        .options(selectinload(User.client_hunter_profile))
+        select(user_columns, client_hunter_columns)
+        .outerjoin(ClientHunter, ClientHunter.user_id == User.id)
         .where(
             User.id == client_hunter_id, 
             User.user_type == "client_hunter"
         )
     )
-    user = result.scalar_one_or_none()
+    row = result.first()
 
-    if not user:
+    if not row:
         raise HTTPException(status_code=404, detail="Client hunter not found")
 
-    response_data = {
-        "id": user.id,
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "phone": user.phone,
-        "profile_picture": user.profile_picture,
-        "user_type": user.user_type,
-        "is_active": user.is_active,
-        "created_at": user.created_at,
-        "updated_at": user.updated_at,
-    }
-
-    if user.client_hunter_profile:
-        client_hunter = user.client_hunter_profile
-        response_data["client_hunter_profile"] = ClientHunterProfileSummary(
-            id=client_hunter.id,
-            first_name=client_hunter.first_name,
-            last_name=client_hunter.last_name,
-            country=client_hunter.country,
-            is_paid=client_hunter.is_paid,
-            payment_date=client_hunter.payment_date,
-            created_at=client_hunter.created_at,
-            updated_at=client_hunter.updated_at
+    response_data = row.user._asdict()
+
+    if row.client_hunter.id is not None:
+        # Trusted database row, so validation is skipped.
+        response_data["client_hunter_profile"] = (
+            ClientHunterProfileSummary.model_construct(
+                **row.client_hunter._asdict())
         )
 
     return response_data
@@ -105,7 +92,18 @@ async def update_client_hunter(
     await session.commit()
     await session.refresh(user)
 
-    return UserRead.model_validate(user)
+    return UserRead.model_construct(
+        id=user.id,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        phone=user.phone,
+        profile_picture=user.profile_picture,
+        user_type=user.user_type,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        updated_at=user.updated_at
+    )
 
 @router.patch("/toggle_status/{client_hunter_id}", response_model=StatusToggleResponse)
 async def toggle_client_hunter_status(
@@ -120,42 +118,44 @@ async def toggle_client_hunter_status(
         )
 
     result = await session.execute(
-        select(User).where(User.id == client_hunter_id, 
-            User.user_type == "client_hunter")
+        update(User)
+        .where(
+            User.id == client_hunter_id,
+            User.user_type == "client_hunter"
+        )
+        .values(is_active=not_(User.is_active))
+        .returning(User.is_active)
     )
-    user = result.scalar_one_or_none()
+    is_active = result.scalar_one_or_none()
 
-    if not user:
+    if is_active is None:
         raise HTTPException(status_code=404, detail="Client hunter not found")
 
-    user.is_active = not user.is_active
     await session.commit()
 
-    status_text = "activated" if user.is_active else "deactivated"
+    status_text = "activated" if is_active else "deactivated"
     return StatusToggleResponse(
         message=f"Client hunter status {status_text}",
-        is_active=user.is_active
+        is_active=is_active
     )
 
 @router.get("/stats/summary", response_model=ClientHunterStatsResponse)
 async def get_client_hunter_stats(session: AsyncSession = Depends(get_db)):
     try:
-        total_client_hunters = await session.scalar(
-            select(func.count(User.id)).where(
-                User.user_type == "client_hunter"
-            )
-        )
-
-        active_client_hunters = await session.scalar(
-            select(func.count(User.id)).where(
-                User.user_type == "client_hunter",
-                User.is_active
-            )
-        )
-
-        paid_client_hunters = await session.scalar(
-            select(func.count(ClientHunter.id)).where(ClientHunter.is_paid)
+        result = await session.execute(
+            select(
+                func.count(User.id),
+                func.count(User.id).filter(User.is_active),
+                select(func.count(ClientHunter.id))
+                .where(ClientHunter.is_paid)
+                .scalar_subquery()
+            ).where(User.user_type == "client_hunter")
         )
+        (
+            total_client_hunters,
+            active_client_hunters,
+            paid_client_hunters
+        ) = result.one()
 
         return {
             "total_client_hunters": total_client_hunters or 0,
@@ -164,5 +164,5 @@ async def get_client_hunter_stats(session: AsyncSession = Depends(get_db)):
         }
 
     except Exception as e:
-        logger.error(f"Error getting client hunter stats: {e}")
+        logger.error("Error getting client hunter stats: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,14 +1,25 @@
 from typing import List, Optional
 
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
-from sqlalchemy import func, or_, select, text
+from sqlalchemy import (
+    Text,
+    cast,
+    func,
+    not_,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
 from app.core.db import get_db
 from app.core.logger import get_logger
+from app.core.responses import ORJSONResponse
 from app.models.freelancer import Freelancer
+from app.models.project import Project
 from app.models.user import User
 from app.schemas.freelancer_schema import (
     DashboardFreelancerResponse,
@@ -19,8 +30,10 @@ from app.schemas.user_schema import (
     ComprehensiveUserResponse,
     FreelancerProfileSummary,
     ProjectSummary,
+    UserRead,
 )
 from app.utils.auth_utils import get_current_user
+from app.utils.query_utils import schema_bundle
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/freelancer", tags=["Freelancer Management"])
@@ -30,6 +43,32 @@ class FilterOptionsResponse(BaseModel):
     hourly_rate_range: dict
     experience_range: dict
 
+USER_FIELDS = frozenset({
+    'email', 'first_name', 'last_name', 'phone', 'profile_picture', 'is_active'
+})
+FREELANCER_FIELDS = frozenset({
+    'title', 'bio', 'hourly_rate', 'years_of_experience', 'skills',
+    'portfolio_url', 'github_url', 'linkedin_url', 'is_available', 'country'
+})
+URL_FIELDS = frozenset({'portfolio_url', 'github_url', 'linkedin_url'})
+
+user_columns = schema_bundle("user", User, UserRead)
+freelancer_columns = schema_bundle(
+    "freelancer", Freelancer, FreelancerProfileSummary)
+project_columns = schema_bundle("project", Project, ProjectSummary)
+
+skills_text = cast(Freelancer.skills, Text)
+
+filter_options_cache: TTLCache[str, dict] = TTLCache(maxsize=1, ttl=60)
+
+def invalidate_filter_options() -> None:
+    filter_options_cache.clear()
+
+async def fetch_skill_options(session: AsyncSession) -> List[str]:
+    skill = func.jsonb_array_elements_text(Freelancer.skills).label("skill")
+    result = await session.execute(select(skill).distinct().order_by(skill))
+    return list(result.scalars().all())
+
 class FreelancerStatsResponse(BaseModel):
     total_freelancers: int
     active_freelancers: int
@@ -51,6 +90,25 @@ class FreelancerUpdate(BaseModel):
     is_available: Optional[bool] = None
     country: Optional[str] = None
 
+# Summaries are built from rows we just loaded from the database, so they
+# skip validation with model_construct.
+def build_freelancer_summary(freelancer: Freelancer) -> FreelancerProfileSummary:
+    return FreelancerProfileSummary.model_construct(
+        id=freelancer.id,
+        title=freelancer.title,
+        bio=freelancer.bio,
+        hourly_rate=freelancer.hourly_rate,
+        years_of_experience=freelancer.years_of_experience,
+        skills=freelancer.skills,
+        portfolio_url=freelancer.portfolio_url,
+        github_url=freelancer.github_url,
+        linkedin_url=freelancer.linkedin_url,
+        is_available=freelancer.is_available,
+        country=freelancer.country,
+        created_at=freelancer.created_at,
+        updated_at=freelancer.updated_at
+    )
+
 @router.get("/all", response_model=List[DashboardFreelancerResponse])
 async def get_all_freelancers(
     skip: int = Query(0, ge=0),
@@ -65,8 +123,18 @@ async def get_all_freelancers(
 ):
     try:
         query = (
-            select(Freelancer, User)
-            .options(selectinload(Freelancer.projects))
+            select(
+                User.profile_picture.label("freelancer_image"),
+                Freelancer.title.label("freelancer_position"),
+                Freelancer.hourly_rate.label("freelancer_rate"),
+                Freelancer.years_of_experience.label("freelancer_experience"),
+                Freelancer.skills,
+                User.id.label("user_id"),
+                Freelancer.id.label("freelancer_id"),
+                User.first_name.label("freelancer_first_name"),
+                User.last_name.label("freelancer_last_name")
+            )
+            .select_from(Freelancer)
             .join(User, Freelancer.user_id == User.id)
             .where(User.user_type == "freelancer")
         )
@@ -83,53 +151,34 @@ async def get_all_freelancers(
         if max_experience is not None:
             query = query.where(Freelancer.years_of_experience <= max_experience)
 
-        if skills:
-            skill_list = [skill.strip().lower() for skill in skills.split(",")]
-            skill_conditions = []
-            for i, skill in enumerate(skill_list):
-                skill_conditions.append(
-                    text(
-                        f"freelancers.skills::text ILIKE :skill_pattern_{i}"
-                    ).bindparams(
-                        **{f"skill_pattern_{i}": f"%{skill}%"}
-                    )
-                )
-            query = query.where(or_(*skill_conditions))
+        skill_list = [
+            skill.strip().lower()
+            for skill in (skills or "").split(",") if skill.strip()
+        ]
+        if skill_list:
+            query = query.where(
+                or_(*(skills_text.ilike(f"%{skill}%") for skill in skill_list))
+            )
 
         if search_query:
-            search_term = f"%{search_query.lower()}%"
+            search_term = f"%{search_query}%"
             query = query.where(
                 or_(
-                    func.lower(User.first_name).like(search_term),
-                    func.lower(User.last_name).like(search_term),
-                    func.lower(Freelancer.title).like(search_term),
-                    func.lower(Freelancer.bio).like(search_term)
+                    User.first_name.ilike(search_term),
+                    User.last_name.ilike(search_term),
+                    Freelancer.title.ilike(search_term),
+                    Freelancer.bio.ilike(search_term)
                 )
             )
 
         query = query.offset(skip).limit(limit)
         result = await session.execute(query)
-        rows = result.all()
-
-        dashboard_freelancers = []
-        for freelancer, user in rows:
-            freelancer_data = {
-                "freelancer_image": user.profile_picture,
-                "freelancer_position": freelancer.title,
-                "freelancer_rate": freelancer.hourly_rate,
-                "freelancer_experience": freelancer.years_of_experience,
-                "skills": freelancer.skills,
-                "user_id": user.id,
-                "freelancer_id": freelancer.id,
-                "freelancer_first_name": user.first_name,
-                "freelancer_last_name": user.last_name,
-            }
-            dashboard_freelancers.append(freelancer_data)
 
-        return dashboard_freelancers
+        return ORJSONResponse(
+            content=[dict(row) for row in result.mappings()])
 
     except Exception as e:
-        logger.error(f"Error listing freelancers: {e}")
+        logger.error("Error listing freelancers: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{freelancer_id}", response_model=ComprehensiveUserResponse)
@@ -138,66 +187,34 @@ async def get_freelancer(
     session: AsyncSession = Depends(get_db)
 ):
     result = await session.execute(
-        select(User)
-        .options(
-            selectinload(User.freelancer_profile).selectinload(Freelancer.projects)
-        )
+        select(user_columns, freelancer_columns, project_columns)
+        .outerjoin(Freelancer, Freelancer.user_id == User.id)
+        .outerjoin(Project, Project.freelancer_id == Freelancer.id)
         .where(
             User.id == freelancer_id, 
             User.user_type == "freelancer"
         )
     )
-    user = result.scalar_one_or_none()
+    rows = result.all()
 
-    if not user:
+    if not rows:
         raise HTTPException(status_code=404, detail="Freelancer not found")
 
-    response_data = {
-        "id": user.id,
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "phone": user.phone,
-        "profile_picture": user.profile_picture,
-        "user_type": user.user_type,
-        "is_active": user.is_active,
-        "created_at": user.created_at,
-        "updated_at": user.updated_at,
-    }
-
-    if user.freelancer_profile:
-        freelancer = user.freelancer_profile
-        response_data["freelancer_profile"] = FreelancerProfileSummary(
-            id=freelancer.id,
-            title=freelancer.title,
-            bio=freelancer.bio,
-            hourly_rate=freelancer.hourly_rate,
-            years_of_experience=freelancer.years_of_experience,
-            skills=freelancer.skills,
-            portfolio_url=freelancer.portfolio_url,
-            github_url=freelancer.github_url,
-            linkedin_url=freelancer.linkedin_url,
-            is_available=freelancer.is_available,
-            country=freelancer.country,
-            created_at=freelancer.created_at,
-            updated_at=freelancer.updated_at
+    response_data = rows[0].user._asdict()
+
+    if rows[0].freelancer.id is not None:
+        response_data["freelancer_profile"] = (
+            FreelancerProfileSummary.model_construct(
+                **rows[0].freelancer._asdict())
         )
 
-        if freelancer.projects:
-            response_data["projects"] = [
-                ProjectSummary(
-                    id=project.id,
-                    title=project.title,
-                    description=project.description,
-                    url=project.url,
-                    cover_image=project.cover_image,
-                    earned=project.earned,
-                    time_taken=project.time_taken,
-                    created_at=project.created_at,
-                    updated_at=project.updated_at
-                )
-                for project in freelancer.projects
-            ]
+        projects = [
+            ProjectSummary.model_construct(**row.project._asdict())
+            for row in rows
+            if row.project.id is not None
+        ]
+        if projects:
+            response_data["projects"] = projects
 
     return response_data
 
@@ -215,52 +232,41 @@ async def update_freelancer(
         )
 
     result = await session.execute(
-        select(User).where(
+        select(User)
+        .options(joinedload(User.freelancer_profile))
+        .where(
             User.id == freelancer_id, 
             User.user_type == "freelancer"
         )
     )
-    user = result.scalar_one_or_none()
+    user = result.unique().scalar_one_or_none()
 
     if not user:
         raise HTTPException(status_code=404, detail="Freelancer not found")
 
-    result = await session.execute(
-        select(Freelancer).where(Freelancer.user_id == freelancer_id)
-    )
-    freelancer = result.scalar_one_or_none()
+    freelancer = user.freelancer_profile
 
     if not freelancer:
         raise HTTPException(status_code=404, detail="Freelancer profile not found")
 
-    user_fields = [
-        'email', 'first_name', 'last_name', 'phone', 'profile_picture', 'is_active'
-    ]
-    for field in user_fields:
-        if field in update_data.model_dump(exclude_unset=True):
-            value = getattr(update_data, field)
-            setattr(user, field, value)
+    changed = update_data.model_dump(exclude_unset=True)
 
-    freelancer_fields = [
-        'title', 'bio', 'hourly_rate', 'years_of_experience', 'skills',
-        'portfolio_url', 'github_url', 'linkedin_url', 'is_available', 'country'
-    ]
-    for field in freelancer_fields:
-        if field in update_data.model_dump(exclude_unset=True):
-            value = getattr(update_data, field)
-            if (hasattr(value, '__str__') and 
-                field in ['portfolio_url', 'github_url', 'linkedin_url']):
+    for field, value in changed.items():
+        if field in USER_FIELDS:
+            setattr(user, field, value)
+        elif field in FREELANCER_FIELDS:
+            if value is not None and field in URL_FIELDS:
                 value = str(value)
             setattr(freelancer, field, value)
 
     try:
         await session.commit()
-        await session.refresh(user)
-        await session.refresh(freelancer)
-        
-        return FreelancerProfileSummary.model_validate(freelancer)
+
+        invalidate_filter_options()
+
+        return build_freelancer_summary(freelancer)
     except Exception as e:
-        logger.error(f"Error updating profile: {str(e)}")
+        logger.error("Error updating profile: %s", e)
         await session.rollback()
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
@@ -277,54 +283,47 @@ async def toggle_freelancer_status(
         )
 
     result = await session.execute(
-        select(User).where(
-            User.id == freelancer_id, 
+        update(User)
+        .where(
+            User.id == freelancer_id,
             User.user_type == "freelancer"
         )
+        .values(is_active=not_(User.is_active))
+        .returning(User.is_active)
     )
-    user = result.scalar_one_or_none()
+    is_active = result.scalar_one_or_none()
 
-    if not user:
+    if is_active is None:
         raise HTTPException(status_code=404, detail="Freelancer not found")
 
-    user.is_active = not user.is_active
     await session.commit()
 
-    status_text = "activated" if user.is_active else "deactivated"
+    status_text = "activated" if is_active else "deactivated"
     return StatusToggleResponse(
         message=f"Freelancer status {status_text}",
-        is_active=user.is_active
+        is_active=is_active
     )
 
 @router.get("/filters/options", response_model=FilterOptionsResponse)
 async def get_filter_options(session: AsyncSession = Depends(get_db)):
-    try:
-        skills_result = await session.execute(select(Freelancer.skills))
-        all_skills = []
-        for row in skills_result:
-            if row[0]:
-                all_skills.extend(row[0])
-
-        rates_result = await session.execute(
-            select(
-            func.min(Freelancer.hourly_rate), 
-            func.max(Freelancer.hourly_rate)
-        )
-        )
-        rate_row = rates_result.first()
-        min_rate, max_rate = (rate_row[0], rate_row[1]) if rate_row else (0, 100)
+    cached_options = filter_options_cache.get("filter_options")
+    if cached_options is not None:
+        return cached_options
 
-        experience_result = await session.execute(
+    try:
+        all_skills = await fetch_skill_options(session)
+        ranges_result = await session.execute(
             select(
+                func.min(Freelancer.hourly_rate),
+                func.max(Freelancer.hourly_rate),
                 func.min(Freelancer.years_of_experience),
                 func.max(Freelancer.years_of_experience)
             )
         )
-        exp_row = experience_result.first()
-        min_exp, max_exp = (exp_row[0], exp_row[1]) if exp_row else (0, 20)
+        min_rate, max_rate, min_exp, max_exp = ranges_result.one()
 
-        return {
-            "skills": list(set(all_skills)),
+        filter_options = {
+            "skills": all_skills,
             "hourly_rate_range": {
                 "min": min_rate or 0,
                 "max": max_rate or 100
@@ -334,9 +333,12 @@ async def get_filter_options(session: AsyncSession = Depends(get_db)):
                 "max": max_exp or 20
             }
         }
+        filter_options_cache["filter_options"] = filter_options
+
+        return filter_options
 
     except Exception as e:
-        logger.error(f"Error getting filter options: {e}")
+        logger.error("Error getting filter options: %s", e)
         return {
             "skills": [],
             "hourly_rate_range": {"min": 0, "max": 100},
@@ -346,24 +348,20 @@ async def get_filter_options(session: AsyncSession = Depends(get_db)):
 @router.get("/stats/summary", response_model=FreelancerStatsResponse)
 async def get_freelancer_stats(session: AsyncSession = Depends(get_db)):
     try:
-        total_freelancers = await session.scalar(
-            select(func.count(User.id)).where(
-                User.user_type == "freelancer"
-            )
-        )
-
-        active_freelancers = await session.scalar(
-            select(func.count(User.id)).where(
-                User.user_type == "freelancer",
-                User.is_active
-            )
-        )
-
-        available_freelancers = await session.scalar(
-            select(func.count(Freelancer.id)).where(
-                Freelancer.is_available
-            )
+        result = await session.execute(
+            select(
+                func.count(User.id),
+                func.count(User.id).filter(User.is_active),
+                select(func.count(Freelancer.id))
+                .where(Freelancer.is_available)
+                .scalar_subquery()
+            ).where(User.user_type == "freelancer")
         )
+        (
+            total_freelancers,
+            active_freelancers,
+            available_freelancers
+        ) = result.one()
 
         return {
             "total_freelancers": total_freelancers or 0,
@@ -372,5 +370,5 @@ async def get_freelancer_stats(session: AsyncSession = Depends(get_db)):
         }
 
     except Exception as e:
-        logger.error(f"Error getting freelancer stats: {e}")
+        logger.error("Error getting freelancer stats: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -11,24 +11,20 @@ from app.routers.project_router import router as project_router
 from app.routers.user_management_router import router as user_management_router
 from app.routers.websocket_router import router as websocket_router
 
-router = APIRouter()
-
-router.include_router(health_router)
-
-router.include_router(auth_router)
-
-router.include_router(user_management_router)
-
-router.include_router(client_hunter_router)
+ROUTERS = (
+    health_router,
+    auth_router,
+    user_management_router,
+    client_hunter_router,
+    freelancer_router,
+    project_router,
+    chat_router,
+    message_router,
+    payment_router,
+    websocket_router,
+)
 
-router.include_router(freelancer_router)
-
-router.include_router(project_router)
-
-router.include_router(chat_router)
-
-router.include_router(message_router)
-
-router.include_router(payment_router)
+router = APIRouter()
 
-router.include_router(websocket_router)
+for included_router in ROUTERS:
+    router.include_router(included_router)
@@ -1,16 +1,27 @@
-from datetime import datetime, timezone
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, func, or_, select
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import Row, Select, and_, desc, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
 from app.core.db import get_db
 from app.models.chat import Chat
 from app.models.message import Message
 from app.models.user import User, UserType
-from app.routers.chat_router import get_chat_participant
+from app.routers.chat_router import (
+    get_participant_chat_version,
+    get_user_chat_ids,
+    invalidate_chat_stats,
+)
 from app.routers.user_management_router import get_current_user
 from app.schemas.message_schema import (
     MessageCreate,
@@ -18,9 +29,46 @@ from app.schemas.message_schema import (
     MessageRead,
     MessageWithSender,
 )
+from app.utils.http_cache import etag_matches, make_etag
 
 router = APIRouter(prefix="/messages", tags=["Message Management"])
 
+STREAM_PAGE_THRESHOLD = 50
+
+def build_message_with_sender(message: Message) -> MessageWithSender:
+    sender = message.sender
+    return MessageWithSender.model_construct(
+        id=message.id,
+        content=message.content,
+        content_type=message.content_type,
+        chat_id=message.chat_id,
+        sender_id=message.sender_id,
+        created_at=message.created_at,
+        updated_at=message.updated_at,
+        sender_name=sender.full_name if sender else "",
+        sender_type=sender.user_type if sender else UserType.CLIENT_HUNTER,
+        sender_avatar=sender.profile_picture if sender else None
+    )
+
+# Large pages are streamed in partitions so each batch of ORM rows can be
+# released once it has been turned into a response item.
+async def fetch_messages_with_sender(
+    session: AsyncSession,
+    query: Select,
+    size: int
+) -> list[MessageWithSender]:
+    if size <= STREAM_PAGE_THRESHOLD:
+        result = await session.execute(query)
+        return [build_message_with_sender(msg) for msg in result.scalars()]
+
+    stream = await session.stream_scalars(
+        query.execution_options(yield_per=STREAM_PAGE_THRESHOLD))
+    return [
+        build_message_with_sender(msg)
+        async for partition in stream.partitions()
+        for msg in partition
+    ]
+
 @router.post("/", response_model=MessageRead, status_code=status.HTTP_201_CREATED)
 async def send_message(
     message_data: MessageCreate,
@@ -28,7 +76,8 @@ async def send_message(
     session: Annotated[AsyncSession, Depends(get_db)]
 ):
     chat_result = await session.execute(
-        select(Chat).where(
+        update(Chat)
+        .where(
             and_(
                 Chat.id == message_data.chat_id,
                 or_(
@@ -37,10 +86,12 @@ async def send_message(
                 )
             )
         )
+        .values(last_message_at=func.timezone("utc", func.now()))
+        .returning(Chat.initiator_id, Chat.participant_id)
     )
-    chat = chat_result.scalar_one_or_none()
+    chat_members = chat_result.one_or_none()
 
-    if not chat:
+    if not chat_members:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Chat not found or access denied"
@@ -55,103 +106,62 @@ async def send_message(
 
     session.add(message)
 
-    setattr(chat, 'last_message_at', datetime.now(
-        timezone.utc).replace(tzinfo=None))
-    session.add(chat)
-
     await session.commit()
-    await session.refresh(message)
+
+    invalidate_chat_stats(*chat_members)
 
     return message
 
 @router.get("/chat/{chat_id}", response_model=MessageList)
 async def get_chat_messages(
-    chat: Annotated[Chat, Depends(get_chat_participant)],
+    request: Request,
+    response: Response,
+    chat_version: Annotated[Row, Depends(get_participant_chat_version)],
     session: Annotated[AsyncSession, Depends(get_db)],
-    page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(50, ge=1, le=200, description="Page size")
+    cursor: Optional[int] = Query(
+        None, description="Return messages older than this message ID"),
+    size: int = Query(50, ge=1, le=200, description="Page size"),
+    include_total: bool = Query(
+        False, description="Also count every message in the chat")
 ):
-    count_query = select(func.count(Message.id)).where(
-        Message.chat_id == chat.id
-    )
-    total_result = await session.execute(count_query)
-    total = total_result.scalar() or 0
+    chat_id = chat_version.id
+    etag = make_etag(*chat_version, str(request.query_params))
+    cache_headers = {"ETag": etag, "Cache-Control": "private, must-revalidate"}
+    if etag_matches(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    response.headers.update(cache_headers)
 
-    query = select(Message).options(
-        selectinload(Message.sender)
-    ).where(
-        Message.chat_id == chat.id
-    ).order_by(Message.created_at)
-
-    query = query.offset((page - 1) * size).limit(size)
-    result = await session.execute(query)
-    messages = result.scalars().all()
-
-    message_list = []
-    for msg in messages:
-        message_with_sender = MessageWithSender(
-            **msg.__dict__,
-            sender_name=msg.sender.full_name if msg.sender else "",
-            sender_type=msg.sender.user_type if msg.sender else UserType.CLIENT_HUNTER,
-            sender_avatar=msg.sender.profile_picture if msg.sender else None
+    total = None
+    if include_total:
+        count_query = select(func.count(Message.id)).where(
+            Message.chat_id == chat_id
         )
-        message_list.append(message_with_sender)
+        total_result = await session.execute(count_query)
+        total = total_result.scalar() or 0
 
-    return MessageList(
-        messages=message_list,
-        total=total,
-        page=page,
-        size=size,
-        has_next=page * size < total,
-        has_prev=page > 1
+    query = select(Message).options(
+        joinedload(Message.sender)
+    ).where(
+        Message.chat_id == chat_id
     )
 
-@router.get("/{message_id}", response_model=MessageWithSender)
-async def get_message(
-    message_id: int,
-    current_user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
-):
-    result = await session.execute(
-        select(Message).options(
-            selectinload(Message.sender)
-        ).where(
-            Message.id == message_id
-        )
-    )
-    message = result.scalar_one_or_none()
+    if cursor is not None:
+        query = query.where(Message.id < cursor)
 
-    if not message:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message not found"
-        )
+    query = query.order_by(desc(Message.id)).limit(size + 1)
+    message_list = await fetch_messages_with_sender(session, query, size)
 
-    chat_result = await session.execute(
-        select(Chat).where(
-            and_(
-                Chat.id == message.chat_id,
-                or_(
-                    Chat.initiator_id == current_user.id,
-                    Chat.participant_id == current_user.id
-                )
-            )
-        )
-    )
-    chat = chat_result.scalar_one_or_none()
+    has_next = len(message_list) > size
+    message_list = message_list[:size][::-1]
 
-    if not chat:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to this message"
-        )
-
-    return MessageWithSender(
-        **message.__dict__,
-        sender_name=message.sender.full_name if message.sender else "",
-        sender_type=message.sender.user_type if message.sender else
-        UserType.CLIENT_HUNTER,
-        sender_avatar=message.sender.profile_picture if message.sender else None
+    return MessageList(
+        messages=message_list,
+        total=total,
+        size=size,
+        has_next=has_next,
+        has_prev=cursor is not None,
+        next_cursor=message_list[0].id if has_next else None
     )
 
 @router.get("/search", response_model=MessageList)
@@ -170,18 +180,15 @@ async def search_messages(
         None, description="Search messages from specific user"
     ),
     page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(20, ge=1, le=100, description="Page size")
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+    include_total: bool = Query(
+        False, description="Also count every matching message")
 ):
-    user_chats_query = select(Chat.id).where(
-        or_(
-            Chat.initiator_id == current_user.id,
-            Chat.participant_id == current_user.id
-        )
-    )
+    user_chat_ids = await get_user_chat_ids(current_user.id, session)
 
     message_query = select(Message).where(
         and_(
-            Message.chat_id.in_(user_chats_query),
+            Message.chat_id.in_(user_chat_ids),
             Message.content.ilike(f"%{query}%")
         )
     )
@@ -191,34 +198,70 @@ async def search_messages(
     if sender_id:
         message_query = message_query.where(Message.sender_id == sender_id)
 
-    count_query = select(func.count()).select_from(message_query.subquery())
-    total_result = await session.execute(count_query)
-    total = total_result.scalar() or 0
+    total = None
+    if include_total:
+        count_query = select(func.count()).select_from(
+            message_query.subquery())
+        total_result = await session.execute(count_query)
+        total = total_result.scalar() or 0
+
     message_query = message_query.order_by(Message.created_at)
-    message_query = message_query.offset((page - 1) * size).limit(size)
+    message_query = message_query.offset((page - 1) * size).limit(size + 1)
 
     message_query = message_query.options(
-        selectinload(Message.sender)
+        joinedload(Message.sender)
     )
 
-    result = await session.execute(message_query)
-    messages = result.scalars().all()
+    message_list = await fetch_messages_with_sender(
+        session, message_query, size)
 
-    message_list = []
-    for msg in messages:
-        message_with_sender = MessageWithSender(
-            **msg.__dict__,
-            sender_name=msg.sender.full_name if msg.sender else "",
-            sender_type=msg.sender.user_type if msg.sender else UserType.CLIENT_HUNTER,
-            sender_avatar=msg.sender.profile_picture if msg.sender else None
-        )
-        message_list.append(message_with_sender)
+    has_next = len(message_list) > size
+    message_list = message_list[:size]
 
     return MessageList(
         messages=message_list,
         total=total,
         page=page,
         size=size,
-        has_next=page * size < total,
+        has_next=has_next,
         has_prev=page > 1
     )
+
+@router.get("/{message_id}", response_model=MessageWithSender)
+async def get_message(
+    message_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)]
+):
+    result = await session.execute(
+        select(Message).options(
+            joinedload(Message.sender)
+        ).join(
+            Chat, Chat.id == Message.chat_id
+        ).where(
+            and_(
+                Message.id == message_id,
+                or_(
+                    Chat.initiator_id == current_user.id,
+                    Chat.participant_id == current_user.id
+                )
+            )
+        )
+    )
+    message = result.scalar_one_or_none()
+
+    if not message:
+        message_exists = await session.scalar(
+            select(Message.id).where(Message.id == message_id)
+        )
+        if message_exists is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Message not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this message"
+        )
+
+    return build_message_with_sender(message)
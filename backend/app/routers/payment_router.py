@@ -1,10 +1,22 @@
+import asyncio
 import json
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 
 import stripe
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import select
+from cachetools import TTLCache
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, exists, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
@@ -12,6 +24,7 @@ from app.core.logger import get_logger
 from app.models.client_hunter import ClientHunter
 from app.models.payment import Payment
 from app.models.user import User
+from app.models.webhook_event import ProcessedWebhookEvent
 from app.schemas.generic import UserJWT
 from app.schemas.payment_schema import (
     ManualPaymentUpdateResponse,
@@ -24,20 +37,125 @@ from app.schemas.payment_schema import (
     WebhookResponse,
 )
 from app.utils.auth_utils import get_current_user
+from app.utils.query_utils import schema_bundle
 from app.utils.stripe_service import StripeService
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
 
+# Paying for platform access is one-way, so users known to have paid can be
+# answered from memory without touching the database or Stripe.
+paid_users_cache: TTLCache[int, bool] = TTLCache(maxsize=10_000, ttl=300)
+
+# A succeeded payment's receipt never changes, so repeat downloads reuse the
+# URL Stripe returned instead of asking for it again.
+receipt_url_cache: TTLCache[int, str] = TTLCache(maxsize=10_000, ttl=3600)
+
+# Succeeded payments are never modified again, so every worker can serve them
+# from memory until they expire.
+succeeded_payment_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=10_000, ttl=3600)
+
+# The first page of each user's payment history, stored as the serialized
+# response body together with the page size it was built for.
+user_payments_cache: TTLCache[int, tuple[int, bytes]] = TTLCache(
+    maxsize=10_000, ttl=60)
+
+def invalidate_user_payments(*user_ids: int) -> None:
+    for user_id in user_ids:
+        user_payments_cache.pop(user_id, None)
+
+# Webhook handlers each hold a pooled connection, so a burst of Stripe
+# events is capped well below the pool size to leave room for other requests.
+WEBHOOK_CONCURRENCY = 10
+webhook_semaphore = asyncio.Semaphore(WEBHOOK_CONCURRENCY)
+
+payment_columns = schema_bundle("payment", Payment, PaymentRead)
+payment_list_adapter = TypeAdapter(List[PaymentRead])
+
+PENDING_PAYMENT_FIELDS = (
+    "user_id", "stripe_payment_intent_id", "amount", "currency", "status",
+    "description", "payment_metadata"
+)
+
+# Hot-path statements are built once with named bind parameters, so each
+# request only supplies values and reuses the compiled SQL.
+insert_pending_payment = insert(Payment.__table__).from_select(
+    PENDING_PAYMENT_FIELDS,
+    select(*(
+        bindparam(name, type_=Payment.__table__.c[name].type)
+        for name in PENDING_PAYMENT_FIELDS
+    )).where(
+        ~exists().where(
+            Payment.user_id == bindparam("user_id"),
+            Payment.status == "succeeded"
+        )
+    )
+).returning(Payment.id)
+
+user_payment_by_intent = select(payment_columns).where(
+    Payment.stripe_payment_intent_id == bindparam("payment_intent_id"),
+    Payment.user_id == bindparam("user_id")
+)
+
+# Marks the matching payment as succeeded and flags its owner's client hunter
+# profile as paid in a single statement. updated_at is set explicitly because
+# onupdate defaults cannot be rendered for both tables. Returns how many
+# payments and client hunter profiles were updated.
+async def mark_payment_succeeded(
+    session: AsyncSession,
+    *criteria,
+    payment_method: str = "card"
+) -> tuple[int, int]:
+    paid_at = func.timezone("utc", func.now())
+
+    paid_payment = (
+        update(Payment)
+        .where(*criteria)
+        .values(
+            status="succeeded",
+            paid_at=paid_at,
+            payment_method=payment_method,
+            updated_at=paid_at
+        )
+        .returning(Payment.user_id)
+        .cte("paid_payment")
+    )
+    paid_profile = (
+        update(ClientHunter)
+        .where(ClientHunter.user_id == paid_payment.c.user_id)
+        .values(
+            is_paid=True,
+            payment_date=func.to_char(paid_at, "YYYY-MM-DD"),
+            updated_at=paid_at
+        )
+        .returning(ClientHunter.id)
+        .cte("paid_profile")
+    )
+    result = await session.execute(
+        select(
+            select(func.count()).select_from(paid_payment).scalar_subquery(),
+            select(func.count()).select_from(paid_profile).scalar_subquery()
+        )
+    )
+    return result.one()
+
 @router.post("/create-payment-intent", response_model=PaymentIntentResponse)
 async def create_payment_intent(
     payment_data: PaymentIntentCreate,
     current_user: UserJWT = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
+    if int(current_user.sub) in paid_users_cache:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Platform access has already been paid"
+        )
+
     try:
-        payment_intent = StripeService.create_payment_intent(
+        payment_intent = await asyncio.to_thread(
+            StripeService.create_payment_intent,
             amount=payment_data.amount,
             currency=payment_data.currency,
             metadata={
@@ -46,22 +164,45 @@ async def create_payment_intent(
             }
         )
 
-        payment_record = Payment(
-            user_id=int(current_user.sub),
-            stripe_payment_intent_id=payment_intent["payment_intent_id"],
-            amount=payment_data.amount,
-            currency=payment_data.currency,
-            status="pending",
-            description=payment_data.description,
-            payment_metadata=json.dumps(
+        payment_values = {
+            "user_id": int(current_user.sub),
+            "stripe_payment_intent_id": payment_intent["payment_intent_id"],
+            "amount": payment_data.amount,
+            "currency": payment_data.currency,
+            "status": "pending",
+            "description": payment_data.description,
+            "payment_metadata": json.dumps(
                 payment_data.metadata) if payment_data.metadata else None
-        )
-        
-        session.add(payment_record)
+        }
+
+        # Insert the pending payment only if the user has not already paid,
+        # so the check and the write happen in one statement.
+        result = await session.execute(insert_pending_payment, payment_values)
+
+        if result.scalar_one_or_none() is None:
+            await session.rollback()
+            paid_users_cache[payment_values["user_id"]] = True
+            # The user has already paid either way, so a failed cancel is
+            # only logged; the intent expires unconfirmed on Stripe's side.
+            try:
+                await asyncio.to_thread(
+                    StripeService.cancel_payment_intent,
+                    payment_intent["payment_intent_id"]
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to cancel unused payment intent "
+                    f"{payment_intent['payment_intent_id']}: {str(e)}"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Platform access has already been paid"
+            )
+
         await session.commit()
-        await session.refresh(payment_record)
 
-        
+        invalidate_user_payments(payment_values["user_id"])
+
         return PaymentIntentResponse(
             client_secret=payment_intent["client_secret"],
             payment_intent_id=payment_intent["payment_intent_id"],
@@ -70,6 +211,8 @@ async def create_payment_intent(
             status=payment_intent["status"]
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating payment intent: {str(e)}")
         raise HTTPException(
@@ -84,13 +227,18 @@ async def get_payment_intent(
     session: AsyncSession = Depends(get_db)
 ):
 
+    cached_payment = succeeded_payment_cache.get(payment_intent_id)
+    if cached_payment and cached_payment["user_id"] == int(current_user.sub):
+        return PaymentRead.model_construct(**cached_payment)
+
     try:
 
         result = await session.execute(
-            select(Payment).where(
-                Payment.stripe_payment_intent_id == payment_intent_id,
-                Payment.user_id == int(current_user.sub)
-            )
+            user_payment_by_intent,
+            {
+                "payment_intent_id": payment_intent_id,
+                "user_id": int(current_user.sub)
+            }
         )
         payment = result.scalar_one_or_none()
 
@@ -100,7 +248,11 @@ async def get_payment_intent(
                 detail="Payment not found"
             )
 
-        return PaymentRead.model_validate(payment)
+        payment = payment._asdict()
+        if payment["status"] == "succeeded":
+            succeeded_payment_cache[payment_intent_id] = payment
+
+        return PaymentRead.model_construct(**payment)
 
     except HTTPException:
         raise
@@ -113,20 +265,35 @@ async def get_payment_intent(
 
 @router.get("/user-payments", response_model=List[PaymentRead])
 async def get_user_payments(
+    cursor: Optional[int] = Query(
+        None, description="Return payments older than this payment ID"),
+    size: int = Query(50, ge=1, le=200, description="Page size"),
     current_user: UserJWT = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
 
+    user_id = int(current_user.sub)
+    cached_page = user_payments_cache.get(user_id)
+    if cursor is None and cached_page and cached_page[0] == size:
+        return Response(content=cached_page[1], media_type="application/json")
+
     try:
+        query = select(payment_columns).where(Payment.user_id == user_id)
+
+        if cursor is not None:
+            query = query.where(Payment.id < cursor)
+
         result = await session.execute(
-            select(Payment).where(Payment.user_id == int(current_user.sub))
-            .order_by(Payment.created_at.desc())
+            query.order_by(Payment.id.desc()).limit(size)
         )
-        payments = result.scalars().all()
 
-        return [
-            PaymentRead.model_validate(payment) for payment in payments
-        ]
+        payments = payment_list_adapter.validate_python(
+            [payment._asdict() for payment in result.scalars()])
+        body = payment_list_adapter.dump_json(payments)
+        if cursor is None:
+            user_payments_cache[user_id] = (size, body)
+
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
         logger.error(f"Error retrieving user payments: {str(e)}")
@@ -155,117 +322,118 @@ async def stripe_webhook(
 
         event = StripeService.construct_webhook_event(payload, sig_header)
 
-        if event["type"] == "payment_intent.succeeded":
-            await handle_payment_succeeded(event, session)
-        elif event["type"] == "payment_intent.payment_failed":
-            await handle_payment_failed(event, session)
-        elif event["type"] == "payment_intent.canceled":
-            await handle_payment_canceled(event, session)
-        else:
-            logger.info(f"Unhandled webhook event type: {event['type']}")
+        # The event is applied before it is acknowledged, so any failure
+        # returns an error and Stripe redelivers it.
+        await process_webhook_event(event, session)
 
         return {"status": "success"}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
-        import traceback
-        logger.error(f"Webhook error traceback: {traceback.format_exc()}")
+        logger.exception(f"Error processing webhook: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Webhook processing failed"
         )
 
+async def process_webhook_event(event: dict, session: AsyncSession):
+
+    async with webhook_semaphore:
+        # Claim the event id in the same transaction as the handler's
+        # writes, so redelivered events are skipped without re-running
+        # the updates.
+        claimed = await session.scalar(
+            pg_insert(ProcessedWebhookEvent)
+            .values(event_id=event["id"], event_type=event["type"])
+            .on_conflict_do_nothing(index_elements=["event_id"])
+            .returning(ProcessedWebhookEvent.id)
+        )
+        if claimed is None:
+            logger.info(f"Skipping already processed webhook event {event['id']}")
+            return
+
+        if event["type"] == "payment_intent.succeeded":
+            await handle_payment_succeeded(event, session)
+        elif event["type"] == "payment_intent.payment_failed":
+            await handle_payment_failed(event, session)
+        elif event["type"] == "payment_intent.canceled":
+            await handle_payment_canceled(event, session)
+        else:
+            logger.info(f"Unhandled webhook event type: {event['type']}")
+
 async def handle_payment_succeeded(event: dict, session: AsyncSession):
 
     payment_intent = event["data"]["object"]
     payment_intent_id = payment_intent["id"]
 
 
-    result = await session.execute(
-        select(Payment).where(
-            Payment.stripe_payment_intent_id == payment_intent_id)
-    )
-    payment = result.scalar_one_or_none()
-
-    if not payment:
-        logger.error(
-            f"Payment not found in database for payment intent: {payment_intent_id}"
-        )
-        return
-
-
-    payment.status = "succeeded"
-    payment.paid_at = datetime.now(timezone.utc).replace(tzinfo=None)
-
     payment_method = payment_intent.get("payment_method")
     if isinstance(payment_method, dict):
-        payment.payment_method = payment_method.get("type", "card")
-    elif isinstance(payment_method, str):
-
-        payment.payment_method = "card"
+        payment_method = payment_method.get("type", "card")
     else:
-        payment.payment_method = "card"
+        payment_method = "card"
 
-    user_result = await session.execute(
-        select(User).where(User.id == payment.user_id)
+    updated_payments, updated_profiles = await mark_payment_succeeded(
+        session,
+        Payment.stripe_payment_intent_id == payment_intent_id,
+        payment_method=payment_method
     )
-    user = user_result.scalar_one_or_none()
 
-    if not user:
-        logger.error(f"User not found for payment: {payment.user_id}")
+    if not updated_payments:
+        logger.error(
+            f"Payment not found in database for payment intent: {payment_intent_id}"
+        )
         return
 
-    if user.user_type == "client_hunter":
-        client_hunter_result = await session.execute(
-            select(ClientHunter).where(ClientHunter.user_id == user.id)
+    if not updated_profiles:
+        logger.info(
+            f"No client hunter profile to mark as paid for payment intent: "
+            f"{payment_intent_id}"
         )
-        client_hunter = client_hunter_result.scalar_one_or_none()
-        if client_hunter:
-            logger.info(
-                f"Updating client hunter profile {client_hunter.id} "
-                f"payment status for user {user.id} ({user.email})"
-            )
-            client_hunter.is_paid = True
-            client_hunter.payment_date = datetime.now(
-                timezone.utc).strftime("%Y-%m-%d")
-        else:
-            logger.error(
-                f"Client hunter profile not found for user: {user.id}")
+
     await session.commit()
 
+    # The intent's metadata carries the user it was created for.
+    user_id = (payment_intent.get("metadata") or {}).get("user_id")
+    if user_id:
+        invalidate_user_payments(int(user_id))
+
 async def handle_payment_failed(event: dict, session: AsyncSession):
 
     payment_intent = event["data"]["object"]
     payment_intent_id = payment_intent["id"]
 
+    failed_at = func.timezone("utc", func.now())
     result = await session.execute(
-        select(Payment).where(
-            Payment.stripe_payment_intent_id == payment_intent_id)
+        update(Payment)
+        .where(Payment.stripe_payment_intent_id == payment_intent_id)
+        .values(status="failed", failed_at=failed_at, updated_at=failed_at)
+        .returning(Payment.user_id)
     )
-    payment = result.scalar_one_or_none()
+    user_id = result.scalar()
 
-    if payment:
-        payment.status = "failed"
-        payment.failed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    if user_id is not None:
         await session.commit()
+        invalidate_user_payments(user_id)
 
 async def handle_payment_canceled(event: dict, session: AsyncSession):
 
     payment_intent = event["data"]["object"]
     payment_intent_id = payment_intent["id"]
 
+    canceled_at = func.timezone("utc", func.now())
     result = await session.execute(
-        select(Payment).where(
-            Payment.stripe_payment_intent_id == payment_intent_id)
+        update(Payment)
+        .where(Payment.stripe_payment_intent_id == payment_intent_id)
+        .values(status="canceled", canceled_at=canceled_at, updated_at=canceled_at)
+        .returning(Payment.user_id)
     )
-    payment = result.scalar_one_or_none()
+    user_id = result.scalar()
 
-    if payment:
-        payment.status = "canceled"
-        payment.canceled_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    if user_id is not None:
         await session.commit()
+        invalidate_user_payments(user_id)
 
 @router.get("/receipt/{payment_id}", response_model=ReceiptUrlResponse)
 async def get_receipt_url(
@@ -298,11 +466,23 @@ async def get_receipt_url(
             detail="Receipt is only available for successful payments"
         )
 
+    cached_receipt_url = receipt_url_cache.get(payment.id)
+    if cached_receipt_url is not None:
+        return {"receipt_url": cached_receipt_url}
+
     stripe_payment_intent_id = payment.stripe_payment_intent_id
 
+    # Hand the connection back to the pool before calling Stripe.
+    await session.close()
+
+    # Expanding latest_charge returns the charge with the payment intent, so
+    # the receipt needs one Stripe round-trip instead of two.
     try:
-        payment_intent = stripe.PaymentIntent.retrieve(
-            stripe_payment_intent_id)
+        payment_intent = await asyncio.to_thread(
+            stripe.PaymentIntent.retrieve,
+            stripe_payment_intent_id,
+            expand=["latest_charge"]
+        )
     except stripe.StripeError as e:
         logger.error(f"Stripe error retrieving payment intent: {str(e)}")
         raise HTTPException(
@@ -310,25 +490,15 @@ async def get_receipt_url(
             detail="Failed to retrieve payment intent from Stripe"
         )
 
-    latest_charge_id = payment_intent.latest_charge
+    charge = payment_intent.latest_charge
 
-    if not latest_charge_id:
+    if not charge:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No charge found for this payment intent"
         )
 
-
-    try:
-        charge = stripe.Charge.retrieve(latest_charge_id) # type: ignore
-    except stripe.StripeError as e:
-        logger.error(f"Stripe error retrieving charge: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="Failed to retrieve charge from Stripe"
-        )
-
-    receipt_url = charge.receipt_url
+    receipt_url = charge.receipt_url # type: ignore
 
     if not receipt_url:
         raise HTTPException(
@@ -336,6 +506,8 @@ async def get_receipt_url(
             detail="Receipt URL not available from Stripe"
         )
 
+    receipt_url_cache[payment_id] = receipt_url
+
     return {"receipt_url": receipt_url}
 
 @router.get("/config", response_model=PaymentConfigResponse)
@@ -353,11 +525,19 @@ async def check_payment_status(
     session: AsyncSession = Depends(get_db)
 ):
 
+    if int(current_user.sub) in paid_users_cache:
+        return PaymentStatusResponse(
+            has_paid=True,
+            payment_status="paid"
+        )
+
     try:
         user_result = await session.execute(
-            select(User).where(User.id == int(current_user.sub))
+            select(User.id, User.user_type, ClientHunter)
+            .outerjoin(ClientHunter, ClientHunter.user_id == User.id)
+            .where(User.id == int(current_user.sub))
         )
-        user = user_result.scalar_one_or_none()
+        user = user_result.one_or_none()
 
         if not user:
             raise HTTPException(
@@ -366,16 +546,14 @@ async def check_payment_status(
             )
 
         if user.user_type == "freelancer":
+            paid_users_cache[user.id] = True
             return PaymentStatusResponse(
                 has_paid=True,
                 payment_status="paid"
             )
 
         if user.user_type == "client_hunter":
-            client_hunter_result = await session.execute(
-                select(ClientHunter).where(ClientHunter.user_id == user.id)
-            )
-            client_hunter = client_hunter_result.scalar_one_or_none()
+            client_hunter = user.ClientHunter
 
             if not client_hunter:
                 raise HTTPException(
@@ -383,15 +561,20 @@ async def check_payment_status(
                     detail="Client hunter profile not found"
                 )
 
-            result = await session.execute(
-                select(Payment).where(
-                    Payment.user_id == int(current_user.sub),
-                    Payment.status == "succeeded"
+            successful_payment = None
+            if not client_hunter.is_paid:
+                result = await session.execute(
+                    select(Payment.paid_at)
+                    .where(
+                        Payment.user_id == int(current_user.sub),
+                        Payment.status == "succeeded"
+                    )
+                    .order_by(Payment.id)
+                    .limit(1)
                 )
-            )
-            successful_payment = result.scalar_one_or_none()
+                successful_payment = result.first()
 
-            if successful_payment and not client_hunter.is_paid:
+            if successful_payment:
                 client_hunter.is_paid = True
                 client_hunter.payment_date = (
                     successful_payment.paid_at.strftime("%Y-%m-%d")
@@ -404,6 +587,9 @@ async def check_payment_status(
                     f"Updated payment status for client hunter {client_hunter.id}"
                 )
 
+            if client_hunter.is_paid:
+                paid_users_cache[user.id] = True
+
             return PaymentStatusResponse(
                 has_paid=client_hunter.is_paid,
                 payment_status="paid" if client_hunter.is_paid else "unpaid"
@@ -414,6 +600,8 @@ async def check_payment_status(
             payment_status="unpaid"
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error checking payment status: {str(e)}")
         raise HTTPException(
@@ -433,51 +621,38 @@ async def manual_payment_update(
 
     try:
 
-        payment_result = await session.execute(
-            select(Payment).where(
-                Payment.stripe_payment_intent_id == payment_intent_id,
-                Payment.user_id == int(current_user.sub)
-            )
+        # Payments the webhook already completed are left untouched, so a
+        # late manual update neither rewrites paid_at nor the payment method.
+        updated_payments, updated_profiles = await mark_payment_succeeded(
+            session,
+            Payment.stripe_payment_intent_id == payment_intent_id,
+            Payment.user_id == int(current_user.sub),
+            Payment.status != "succeeded"
         )
-        payment = payment_result.scalar_one_or_none()
 
-        if not payment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Payment not found"
+        if not updated_payments:
+            payment_exists = await session.scalar(
+                select(Payment.id).where(
+                    Payment.stripe_payment_intent_id == payment_intent_id,
+                    Payment.user_id == int(current_user.sub)
+                )
             )
-
-
-        user_result = await session.execute(
-            select(User).where(User.id == int(current_user.sub))
-        )
-        user = user_result.scalar_one_or_none()
-
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
+            if payment_exists is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Payment not found"
+                )
+            return ManualPaymentUpdateResponse(
+                status="success",
+                message="Payment already completed"
             )
 
-        payment.status = "succeeded"
-        payment.paid_at = datetime.now(timezone.utc).replace(tzinfo=None)
-        payment.payment_method = "card"
-
-        if user.user_type == "client_hunter":
-            client_hunter_result = await session.execute(
-                select(ClientHunter).where(ClientHunter.user_id == user.id)
-            )
-            client_hunter = client_hunter_result.scalar_one_or_none()
+        await session.commit()
 
-            if client_hunter:
-                client_hunter.is_paid = True
-                client_hunter.payment_date = datetime.now(
-                    timezone.utc).strftime("%Y-%m-%d")
-            else:
-                logger.error(
-                    f"Client hunter profile not found for user: {user.id}")
+        invalidate_user_payments(int(current_user.sub))
 
-        await session.commit()
+        if updated_profiles:
+            paid_users_cache[int(current_user.sub)] = True
 
         return ManualPaymentUpdateResponse(
             status="success",
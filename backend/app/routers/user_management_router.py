@@ -1,8 +1,8 @@
+import asyncio
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -52,10 +52,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    result = await session.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user = await session.get(User, user_id)
     
     if user is None:
         raise HTTPException(
@@ -88,7 +85,6 @@ async def update_current_user_profile(
         setattr(current_user, field, value)
     
     await session.commit()
-    await session.refresh(current_user)
     
     return UserRead.model_validate(current_user)
 
@@ -113,7 +109,10 @@ async def change_password(
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)]
 ):
-    if not current_user.verify_password(password_data.current_password):
+    password_valid = await asyncio.to_thread(
+        current_user.verify_password, password_data.current_password
+    )
+    if not password_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -125,7 +124,9 @@ async def change_password(
             detail="New password must be at least 8 characters long"
         )
 
-    current_user.set_password(password_data.new_password)
+    await asyncio.to_thread(
+        current_user.set_password, password_data.new_password
+    )
     await session.commit()
 
     return {"message": "Password changed successfully"}
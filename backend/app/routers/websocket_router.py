@@ -1,16 +1,18 @@
 import json
-from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.db import get_db
 from app.core.jwt import verify_access_token
 from app.core.logger import get_logger
 from app.core.websocket_manager import websocket_manager
 from app.models.chat import Chat
+from app.models.message import Message
+from app.models.user import User
 from app.schemas.websocket_schema import ChatStatusResponse
 
 logger = get_logger(__name__)
@@ -33,9 +35,9 @@ async def authenticate_websocket(websocket: WebSocket, token: str) -> dict:
         raise HTTPException(status_code=401, detail="Authentication failed")
 
 
-async def verify_chat_access(chat_id: str, user_id: int, session: AsyncSession) -> Chat:
+async def verify_chat_access(chat_id: str, user_id: int, session: AsyncSession) -> int:
     result = await session.execute(
-        select(Chat).where(
+        select(Chat.id).where(
             and_(
                 Chat.id == int(chat_id),
                 or_(
@@ -45,14 +47,14 @@ async def verify_chat_access(chat_id: str, user_id: int, session: AsyncSession)
             )
         )
     )
-    chat = result.scalar_one_or_none()
+    chat_id = result.scalar_one_or_none()
     
-    if not chat:
+    if chat_id is None:
         raise HTTPException(
             status_code=403, detail="Access denied to chat"
         )
     
-    return chat
+    return chat_id
 
 
 @router.websocket("/ws/chat/{chat_id}")
@@ -105,9 +107,6 @@ async def handle_websocket_message(
         
         if content.strip():
             try:
-                from app.models.message import Message
-                from app.models.user import User
-                
                 user = await session.get(User, user_id)
                 if not user:
                     logger.error(f"User {user_id} not found")
@@ -122,11 +121,15 @@ async def handle_websocket_message(
                     content=content.strip(),
                     content_type=content_type
                 )
-                created_at = datetime.utcnow().isoformat()
-                
                 session.add(message)
+                await session.execute(
+                    update(Chat)
+                    .where(Chat.id == int(chat_id))
+                    .values(last_message_at=func.timezone("utc", func.now()))
+                )
                 await session.flush()
                 message_id = message.id
+                created_at = message.created_at.isoformat()
                 await session.commit()
                 
                 message_data = {
@@ -157,11 +160,6 @@ async def handle_websocket_message(
         size = message_data.get("data", {}).get("size", 20)
         
         try:
-            from sqlalchemy import select
-            from sqlalchemy.orm import selectinload
-
-            from app.models.message import Message
-            
             query = select(Message).options(
                 selectinload(Message.sender)
             ).where(
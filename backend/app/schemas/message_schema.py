@@ -43,11 +43,12 @@ class MessageWithSender(MessageRead):
 class MessageList(BaseModel):
     
     messages: List[MessageWithSender]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[int] = None
 
 class MessageFilter(BaseModel):
     
@@ -1,5 +1,5 @@
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.core.logger import get_logger
 
@@ -12,7 +12,7 @@ class ContentFilter:
         self.url_patterns = [
             r'https?://[^\s]+',
             r'www\.[^\s]+',
-            r'[^\s]+\.(com|org|net|io|co|me|app|dev|tech|ai|ml)',
+            r'[^\s]+\.(?:com|org|net|io|co|me|app|dev|tech|ai|ml)',
         ]
         
         self.contact_patterns = [
@@ -24,58 +24,65 @@ class ContentFilter:
 
         self.url_regex = re.compile('|'.join(self.url_patterns), re.IGNORECASE)
         self.contact_regex = re.compile('|'.join(self.contact_patterns), re.IGNORECASE)
+        self.combined_regex = re.compile(
+            f"(?P<url>{self.url_regex.pattern})"
+            f"|(?P<contact>{self.contact_regex.pattern})",
+            re.IGNORECASE
+        )
+        self.filename_table = str.maketrans(dict.fromkeys('/\\:*?"<>|', '_'))
+
+    def scan(self, content: str) -> Tuple[str, List[str], List[str]]:
+
+        url_matches = []
+        contact_matches = []
+
+        def replace(match: re.Match) -> str:
+            if match.lastgroup == "url":
+                url_matches.append(match.group())
+                return '[URL REMOVED]'
+            contact_matches.append(match.group())
+            return '[CONTACT INFO REMOVED]'
+
+        filtered_content = self.combined_regex.sub(replace, content)
+        return filtered_content, url_matches, contact_matches
     
-    def filter_message(self, content: str) -> Tuple[str, List[str], bool]:
+    def filter_message(self, content: str) -> Tuple[str, Optional[str], bool]:
         
+        filtered_content, url_matches, contact_matches = self.scan(content)
+        if not url_matches and not contact_matches:
+            return filtered_content, None, False
+
         violations = []
-        filtered_content = content
-        is_clean = True
 
-        url_matches = self.url_regex.findall(content)
         if url_matches:
             violations.append(
                 f"URLs detected: {', '.join(url_matches)}"
             )
-            filtered_content = self.url_regex.sub(
-                '[URL REMOVED]', filtered_content
-            )
-            is_clean = False
 
-        contact_matches = self.contact_regex.findall(content)
         if contact_matches:
             violations.append(
                 f"Contact information detected: {', '.join(contact_matches)}"
             )
-            filtered_content = self.contact_regex.sub(
-                '[CONTACT INFO REMOVED]', filtered_content
-            )
-            is_clean = False
 
-        if violations:
-            logger.warning(
-                f"Content filtering violations: {violations}"
-            )
+        flag_reason = ", ".join(violations)
+        logger.warning("Content filtering violations: %s", flag_reason)
         
-        return filtered_content, violations, is_clean
+        return filtered_content, flag_reason, True
     
     def contains_violations(self, content: str) -> bool:
         
-        return bool(
-            self.url_regex.search(content) or 
-            self.contact_regex.search(content)
-        )
+        return self.combined_regex.search(content) is not None
     
     def get_violation_details(self, content: str) -> List[str]:
         
         violations = []
+        _, url_matches, contact_matches = self.scan(content)
 
-        url_matches = self.url_regex.findall(content)
         if url_matches:
             violations.append(
                 f"URLs: {', '.join(url_matches)}"
             )
 
-        contact_matches = self.contact_regex.findall(content)
         if contact_matches:
             violations.append(
                 f"Contact info: {', '.join(contact_matches)}"
@@ -85,10 +92,7 @@ class ContentFilter:
     
     def sanitize_filename(self, filename: str) -> str:
 
-        dangerous_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-        sanitized = filename
-        for char in dangerous_chars:
-            sanitized = sanitized.replace(char, '_')
+        sanitized = filename.translate(self.filename_table)
 
         if len(sanitized) > 100:
             if '.' in sanitized:
@@ -0,0 +1,22 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.md5(
+        repr(parts).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag in (tag.strip() for tag in if_none_match.split(","))
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from sqlalchemy.orm import Bundle
+
+
+def schema_bundle(name: str, model: type, schema: type[BaseModel]) -> Bundle:
+    return Bundle(
+        name, *(getattr(model, field) for field in schema.model_fields)
+    )
@@ -1,5 +1,6 @@
 from typing import Any, Dict, Optional
 
+import orjson
 import stripe
 
 from app.core.config import settings
@@ -57,6 +58,19 @@ class StripeService:
         )
             raise Exception(f"Payment retrieval failed: {str(e)}")
 
+    @staticmethod
+    def cancel_payment_intent(payment_intent_id: str) -> Dict[str, Any]:
+        
+        try:
+            intent = stripe.PaymentIntent.cancel(payment_intent_id)
+            return {
+                "id": intent.id,
+                "status": intent.status
+            }
+        except stripe.StripeError as e:
+            logger.error(f"Stripe error canceling payment intent: {str(e)}")
+            raise Exception(f"Payment cancellation failed: {str(e)}")
+
     @staticmethod
     def confirm_payment_intent(payment_intent_id: str) -> Dict[str, Any]:
         
@@ -101,11 +115,16 @@ class StripeService:
         payload: bytes, sig_header: str
     ) -> Dict[str, Any]:
         
+        # Verify the signature, then parse the raw bytes with orjson into a
+        # plain dict instead of building a tree of StripeObjects.
         try:
-            event = stripe.Webhook.construct_event(
-                payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
+            stripe.WebhookSignature.verify_header(
+                payload.decode("utf-8"),
+                sig_header,
+                settings.STRIPE_WEBHOOK_SECRET,
+                stripe.Webhook.DEFAULT_TOLERANCE
             )
-            return event
+            return orjson.loads(payload)
         except ValueError as e:
             logger.error(f"Invalid payload: {str(e)}")
             raise Exception("Invalid payload")
@@ -117,36 +136,3 @@ class StripeService:
     def get_publishable_key() -> str:
         
         return settings.STRIPE_PUBLISHABLE_KEY
-
-    @staticmethod
-    def retrieve_payment_intent_with_receipt(payment_intent_id: str) -> Dict[str, Any]:
-        
-        try:
-            intent = stripe.PaymentIntent.retrieve(payment_intent_id)
-            return {
-                "id": intent.id,
-                "amount": intent.amount,
-                "currency": intent.currency,
-                "status": intent.status,
-                "metadata": intent.metadata,
-                "client_secret": intent.client_secret,
-                "receipt_url": (
-                    intent.charges.data[0].receipt_url # type: ignore
-                    if intent.charges.data else None # type: ignore
-                )
-            }
-        except stripe.StripeError as e:
-            logger.error(f"Stripe error retrieving payment intent: {str(e)}")
-            raise Exception(f"Payment retrieval failed: {str(e)}")
-
-    @staticmethod
-    def download_receipt_pdf(receipt_url: str) -> bytes:
-        
-        try:
-            import requests
-            response = requests.get(receipt_url)
-            response.raise_for_status()
-            return response.content
-        except Exception as e:
-            logger.error(f"Error downloading receipt PDF: {str(e)}")
-            raise Exception(f"Receipt download failed: {str(e)}")
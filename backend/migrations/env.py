@@ -20,8 +20,10 @@ from app.models.chat import Chat  # noqa: F401, E402
 from app.models.client_hunter import ClientHunter  # noqa: F401, E402
 from app.models.freelancer import Freelancer  # noqa: F401, E402
 from app.models.message import Message  # noqa: F401, E402
+from app.models.payment import Payment  # noqa: F401, E402
 from app.models.project import Project  # noqa: F401, E402
 from app.models.user import User  # noqa: F401, E402
+from app.models.webhook_event import ProcessedWebhookEvent  # noqa: F401, E402
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
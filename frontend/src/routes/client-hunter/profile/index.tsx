@@ -71,7 +71,7 @@ function ClientHunterProfile() {
     useUpdateClientHunterClientHunterClientHunterIdPutMutation();
   const [checkPaymentStatus, { isLoading: isCheckingPayment }] =
     useCheckPaymentStatusPaymentsCheckPaymentStatusPostMutation();
-  const { data: payments, refetch: refetchPayments } = useGetUserPaymentsPaymentsUserPaymentsGetQuery();
+  const { data: payments, refetch: refetchPayments } = useGetUserPaymentsPaymentsUserPaymentsGetQuery({});
   const [changePassword, { isLoading: isChangingPassword }] = useChangePasswordUserChangePasswordPostMutation();
   const [toggleAccountStatus] = useToggleClientHunterStatusClientHunterToggleStatusClientHunterIdPatchMutation();
 
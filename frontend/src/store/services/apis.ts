@@ -282,8 +282,9 @@ const injectedRtkApi = api
         query: (queryArg) => ({
           url: `/messages/chat/${queryArg.chatId}`,
           params: {
-            page: queryArg.page,
+            cursor: queryArg.cursor,
             size: queryArg.size,
+            include_total: queryArg.includeTotal,
           },
         }),
         providesTags: ["Message Management"],
@@ -307,6 +308,7 @@ const injectedRtkApi = api
             sender_id: queryArg.senderId,
             page: queryArg.page,
             size: queryArg.size,
+            include_total: queryArg.includeTotal,
           },
         }),
         providesTags: ["Message Management"],
@@ -335,7 +337,13 @@ const injectedRtkApi = api
         GetUserPaymentsPaymentsUserPaymentsGetApiResponse,
         GetUserPaymentsPaymentsUserPaymentsGetApiArg
       >({
-        query: () => ({ url: `/payments/user-payments` }),
+        query: (queryArg) => ({
+          url: `/payments/user-payments`,
+          params: {
+            cursor: queryArg.cursor,
+            size: queryArg.size,
+          },
+        }),
         providesTags: ["Payments"],
       }),
       stripeWebhookPaymentsWebhookPost: build.mutation<
@@ -526,10 +534,12 @@ export type SendMessageMessagesPostApiArg = {
 export type GetChatMessagesMessagesChatChatIdGetApiResponse = /** status 200 Successful Response */ MessageList;
 export type GetChatMessagesMessagesChatChatIdGetApiArg = {
   chatId: number;
-  /** Page number */
-  page?: number;
+  /** Return messages older than this message ID */
+  cursor?: number | null;
   /** Page size */
   size?: number;
+  /** Also count every message in the chat */
+  includeTotal?: boolean;
 };
 export type GetMessageMessagesMessageIdGetApiResponse = /** status 200 Successful Response */ MessageWithSender;
 export type GetMessageMessagesMessageIdGetApiArg = {
@@ -547,6 +557,8 @@ export type SearchMessagesMessagesSearchGetApiArg = {
   page?: number;
   /** Page size */
   size?: number;
+  /** Also count every matching message */
+  includeTotal?: boolean;
 };
 export type CreatePaymentIntentPaymentsCreatePaymentIntentPostApiResponse =
   /** status 200 Successful Response */ PaymentIntentResponse;
@@ -559,7 +571,12 @@ export type GetPaymentIntentPaymentsPaymentIntentPaymentIntentIdGetApiArg = {
   paymentIntentId: string;
 };
 export type GetUserPaymentsPaymentsUserPaymentsGetApiResponse = /** status 200 Successful Response */ PaymentRead[];
-export type GetUserPaymentsPaymentsUserPaymentsGetApiArg = void;
+export type GetUserPaymentsPaymentsUserPaymentsGetApiArg = {
+  /** Return payments older than this payment ID */
+  cursor?: number | null;
+  /** Page size */
+  size?: number;
+};
 export type StripeWebhookPaymentsWebhookPostApiResponse = /** status 200 Successful Response */ WebhookResponse;
 export type StripeWebhookPaymentsWebhookPostApiArg = void;
 export type GetReceiptUrlPaymentsReceiptPaymentIdGetApiResponse =
@@ -893,11 +910,12 @@ export type MessageWithSender = {
 };
 export type MessageList = {
   messages: MessageWithSender[];
-  total: number;
-  page: number;
+  total?: number | null;
+  page?: number | null;
   size: number;
   has_next: boolean;
   has_prev: boolean;
+  next_cursor?: number | null;
 };
 export type PaymentIntentResponse = {
   client_secret: string;